@@ -6,7 +6,10 @@ the other variables of the triangle, as well as additional things like
 its area and perimeter.
 
 It contains `solve`, which is the main function to solve a triangle,
-which internally will use the `TriangleSolver` class.
+which internally will use the `TriangleSolver` class. When the kind of
+triangle is known up front, `solve_sss`, `solve_sas`, `solve_asa`,
+`solve_aas` and `solve_ssa` solve it directly. Many triangles can be
+solved at once with `solve_batch`, which requires numpy.
 
 Before solving, the triangle is validated. If the triangle is invalid,
 a `TriangleException` will be raised with an an error that can be found
@@ -15,19 +18,35 @@ in the `TriangleError` enum.
 
 from __future__ import annotations
 import math
+import array
 import dataclasses
+import functools
+import sys
+import threading
 from enum import Enum
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 MaybeFloat = Optional[float]
 
+# Uses CORDIC instead of libm for the trig in `solve`, so its results do not depend on the platform's libm.
+# `solve_batch` always uses numpy.
+USE_CORDIC = False
+
+# Dataclass slots need python 3.10, older versions keep a __dict__ per instance
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class TriangleException(Exception):
     """Thrown during solving"""
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(frozen=True, **_SLOTS)
 class Triangle:
     """Complete triangle structure.
     Returned by solve function.
@@ -41,16 +60,128 @@ class Triangle:
     area: float
 
 
-def ensure_size(arr: List, default, size: int) -> List:
-    """Ensures the size of an array by using the default
-    when an element does not exist.
-    """
-    return [arr[x] if x < len(arr) else default for x in range(size)]
+# Indices of the remaining two elements for each index of a 3 element array
+_OTHERS = ((1, 2), (0, 2), (0, 1))
+
+
+def _is_valid_side(side: float, a: float, b: float) -> bool:
+    """Checks a side against the triangle inequality with the other two"""
+    # Comparisons against nan are false, so unknown sides need no separate check
+    return not (side >= a + b or abs(a - b) >= side)
+
+
+def _is_valid_angle(angle: float) -> bool:
+    """Checks if an angle is small enough to be part of a triangle"""
+    return angle < math.pi
+
+
+# How far past 1 a sine from the law of sines may be rounded before there is no triangle
+_SINE_TOLERANCE = 1e-9
+
+# Number of CORDIC iterations, each giving about one more bit of precision
+_CORDIC_STEPS = 40
+
+# arctan(2^-k) for each CORDIC iteration, written out so they do not depend on libm
+_ATAN_POW2 = tuple(float.fromhex(x) for x in """
+    0x1.921fb54442d18p-1 0x1.dac670561bb4fp-2 0x1.f5b75f92c80ddp-3 0x1.fd5ba9aac2f6ep-4
+    0x1.ff55bb72cfdeap-5 0x1.ffd55bba97625p-6 0x1.fff555bbb729bp-7 0x1.fffd555bbba97p-8
+    0x1.ffff5555bbbb7p-9 0x1.ffffd5555bbbcp-10 0x1.fffff55555bbcp-11 0x1.fffffd55555bcp-12
+    0x1.ffffff555555cp-13 0x1.ffffffd555556p-14 0x1.fffffff555555p-15 0x1.fffffffd55555p-16
+    0x1.ffffffff55555p-17 0x1.ffffffffd5555p-18 0x1.fffffffff5555p-19 0x1.fffffffffd555p-20
+    0x1.ffffffffff555p-21 0x1.ffffffffffd55p-22 0x1.fffffffffff55p-23 0x1.fffffffffffd5p-24
+    0x1.ffffffffffff5p-25 0x1.ffffffffffffdp-26 0x1.fffffffffffffp-27 0x1.0000000000000p-27
+    0x1.0000000000000p-28 0x1.0000000000000p-29 0x1.0000000000000p-30 0x1.0000000000000p-31
+    0x1.0000000000000p-32 0x1.0000000000000p-33 0x1.0000000000000p-34 0x1.0000000000000p-35
+    0x1.0000000000000p-36 0x1.0000000000000p-37 0x1.0000000000000p-38 0x1.0000000000000p-39
+""".split())
+
+# Scaling lost to the CORDIC rotations: product of 1 / sqrt(1 + 2^-2k)
+_CORDIC_GAIN = float.fromhex("0x1.36e9db5086bcbp-1")
+
+
+def _cordic_sincos(theta: float) -> Tuple[float, float]:
+    """Calculates sin and cos by CORDIC rotation"""
+    # Reduce to [-pi/4, pi/4] and rotate the result back by the quadrant
+    quadrant = round(theta / (math.pi / 2))
+    z = theta - quadrant * (math.pi / 2)
+    x, y, power = _CORDIC_GAIN, 0.0, 1.0
+    atan_pow2 = _ATAN_POW2
+    for k in range(_CORDIC_STEPS):
+        if z >= 0:
+            x, y, z = x - y * power, y + x * power, z - atan_pow2[k]
+        else:
+            x, y, z = x + y * power, y - x * power, z + atan_pow2[k]
+        power *= 0.5
+
+    quadrant %= 4
+    if quadrant == 0:
+        return y, x
+    if quadrant == 1:
+        return x, -y
+    if quadrant == 2:
+        return -y, -x
+    return -x, y
+
+
+def _cordic_sin(theta: float) -> float:
+    """Calculates sin by CORDIC rotation"""
+    return _cordic_sincos(theta)[0]
+
+
+def _cordic_cos(theta: float) -> float:
+    """Calculates cos by CORDIC rotation"""
+    return _cordic_sincos(theta)[1]
+
+
+def _cordic_atan2(y: float, x: float) -> float:
+    """Calculates atan2 by CORDIC vectoring"""
+    # Vectoring only converges for x > 0, mirror the left half plane into it
+    # atan2(y, x) = pi - atan2(y, -x) for x < 0
+    mirrored = x < 0
+    if mirrored:
+        x = -x
+    z, power = 0.0, 1.0
+    atan_pow2 = _ATAN_POW2
+    for k in range(_CORDIC_STEPS):
+        if y < 0:
+            x, y, z = x - y * power, y + x * power, z - atan_pow2[k]
+        else:
+            x, y, z = x + y * power, y - x * power, z + atan_pow2[k]
+        power *= 0.5
+
+    if not mirrored:
+        return z
+    return (math.pi if z >= 0 else -math.pi) - z
+
 
+def _cordic_acos(x: float) -> float:
+    """Calculates arccos with `_cordic_atan2`"""
+    return _cordic_atan2(math.sqrt((1 - x) * (1 + x)), x)
 
-def rest(arr: List, n: int) -> Tuple[int, int]:
-    """Gets an array of the reamining elements of an array"""
-    return [arr[x] for x in range(len(arr)) if x != n]
+
+def _cordic_asin(x: float) -> float:
+    """Calculates arcsin with `_cordic_atan2`"""
+    return _cordic_atan2(x, math.sqrt((1 - x) * (1 + x)))
+
+
+def _other(a: float, b: float, c: float, sin_a: float, sin_b: float):
+    """Calculates the perimeter, area, altitudes and medians of a solved triangle,
+    given its sides and the sines of the first two angles
+    """
+    sqrt = math.sqrt
+    perimeter = a + b + c
+    # Heron's formula in Kahan's form, which stays accurate for needle-like triangles:
+    # A = sqrt((x + (y + z))(z - (x - y))(z + (x - y))(x + (y - z))) / 4 where x >= y >= z
+    z, y, x = sorted((a, b, c))
+    area = 0.25 * sqrt((x + (y + z)) * (z - (x - y)) * (z + (x - y)) * (x + (y - z)))
+    altitudes = (sin_b * c, sin_a * c, sin_a * b)
+    # Apollonius's theorem: m_a = sqrt(2b^2 + 2c^2 - a^2) / 2
+    medians = (
+        0.5 * sqrt(2 * b * b + 2 * c * c - a * a),
+        0.5 * sqrt(2 * a * a + 2 * c * c - b * b),
+        0.5 * sqrt(2 * a * a + 2 * b * b - c * c),
+    )
+    return perimeter, area, altitudes, medians
 
 
 class TriangleError(Enum):
@@ -64,42 +195,85 @@ class TriangleError(Enum):
     INVALID_TRIANGLE = 6
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(**_SLOTS)
 class TriangleSolver:
     """Main solving class for triangle solver.
     Used in solve() function.
     """
 
-    sides: List[MaybeFloat]
-    angles: List[MaybeFloat]
+    # Replaced by views into buffer once constructed
+    sides: Sequence[MaybeFloat] = dataclasses.field(repr=False, compare=False)
+    angles: Sequence[MaybeFloat] = dataclasses.field(repr=False, compare=False)
     altitudes: List[MaybeFloat] = dataclasses.field(default_factory=lambda: [None] * 3)
     medians: List[MaybeFloat] = dataclasses.field(default_factory=lambda: [None] * 3)
-    is_alternative = False
-    alternative: Optional[TriangleSolver] = None
+    alternative: Optional[Triangle] = None
     perimeter: MaybeFloat = None
     area: MaybeFloat = None
+    # Sides, angles and the sines of the angles, with nan for unknown values
+    buffer: array.array = dataclasses.field(init=False)
+    sines: memoryview = dataclasses.field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        values = [*self.sides, None, None, None][:3] + [*self.angles, None, None, None][:3] + [None] * 3
+        self.buffer = array.array("d", [math.nan if x is None else x for x in values])
+        view = memoryview(self.buffer)
+        self.sides = view[0:3]
+        self.angles = view[3:6]
+        self.sines = view[6:9]
+
+    def reset(self, sides: Sequence[MaybeFloat], angles: Sequence[MaybeFloat]):
+        """Prepares the solver for another triangle,
+        given its known sides and angles with None for unknowns
+        """
+        nan, buffer = math.nan, self.buffer
+        for i, x in enumerate([*sides, None, None, None][:3] + [*angles, None, None, None][:3]):
+            buffer[i] = nan if x is None else x
+        for i in range(6, 9):
+            buffer[i] = nan
+
+        self.alternative = None
+        self.perimeter = None
+        self.area = None
+
+    def known_sides_mask(self) -> int:
+        """Gets a bitmask of the known sides"""
+        isnan = math.isnan
+        sides = self.sides
+        return (not isnan(sides[0])) | (not isnan(sides[1])) << 1 | (not isnan(sides[2])) << 2
 
     def validate_side(self, i: int) -> bool:
         """Checks if a side is valid"""
-        a, b = rest(self.sides, i)
-        return (a is None or b is None) or (self.sides[i] < a + b and self.sides[i] > abs(a - b))
+        sides = self.sides
+        j, k = _OTHERS[i]
+        return _is_valid_side(sides[i], sides[j], sides[k])
 
     def validate_angle(self, i: int) -> bool:
         """Checks if an angle is valid"""
-        return self.angles[i] < math.pi
+        return _is_valid_angle(self.angles[i])
 
     def validate(self, complete=False):
         """Validates the triangle and throws
         a TriangleException if an error is found
         """
+        acos = _cordic_acos if USE_CORDIC else math.acos
+        isnan = math.isnan
+        sides, angles = self.sides, self.angles
+        side_count = angle_count = 0
         for i in range(3):
-            if self.sides[i] is not None and not self.validate_side(i):
-                raise TriangleException(TriangleError.INVALID_SIDE)
-
-            if self.angles[i] is None:
+            if not isnan(sides[i]):
+                side_count += 1
+                # Same check as _is_valid_side, inlined for the hot path
+                j, k = _OTHERS[i]
+                a, b = sides[j], sides[k]
+                if sides[i] >= a + b or abs(a - b) >= sides[i]:
+                    raise TriangleException(TriangleError.INVALID_SIDE)
+
+            if isnan(angles[i]):
                 continue
 
-            if not self.validate_angle(i):
+            angle_count += 1
+            # Same check as _is_valid_angle
+            if not angles[i] < math.pi:
                 raise TriangleException(TriangleError.INVALID_ANGLE)
 
             if not complete:
@@ -107,132 +281,427 @@ class TriangleSolver:
 
             # Law of Cosines: c^2 = a^2 + b^2 - 2ab cos(C)
             # C = arccos((a^2 + b^2 - c^2) / 2ab)
-            a, b = rest(self.sides, i)
-            angle = math.acos((a**2 + b**2 - self.sides[i] ** 2) / (2 * a * b))
-            if not math.isclose(angle, self.angles[i], abs_tol=0.01):
+            j, k = _OTHERS[i]
+            a, b = sides[j], sides[k]
+            angle = acos((a * a + b * b - sides[i] * sides[i]) / (2 * a * b))
+            if not math.isclose(angle, angles[i], abs_tol=0.01):
                 raise TriangleException(TriangleError.INVALID_TRIANGLE)
 
-        side_count = len([x for x in self.sides if x is not None])
-        angle_count = len([x for x in self.angles if x is not None])
+        if complete:
+            return
 
-        if not complete:
-            if side_count + angle_count > 3:
-                raise TriangleException(TriangleError.TOO_MANY_VARIABLES)
+        if side_count + angle_count > 3:
+            raise TriangleException(TriangleError.TOO_MANY_VARIABLES)
 
-            if side_count + angle_count < 3:
-                raise TriangleException(TriangleError.NOT_ENOUGH_VARIABLES)
+        if side_count + angle_count < 3:
+            raise TriangleException(TriangleError.NOT_ENOUGH_VARIABLES)
 
-            if side_count == 0:
-                raise TriangleException(TriangleError.NO_SIDES)
+        if side_count == 0:
+            raise TriangleException(TriangleError.NO_SIDES)
 
     def is_ambigous(self, a: int, b: int) -> bool:
         """Determines if there are two solutions to the problem"""
-        return (
-            self.angles[b] < math.pi / 2
-            and self.sides[a] < self.sides[b]
-            and self.sides[a] > self.sides[b] * math.sin(self.angles[a])
-        )
+        sin = _cordic_sin if USE_CORDIC else math.sin
+        sides, angles = self.sides, self.angles
+        return angles[b] < math.pi / 2 and sides[a] < sides[b] and sides[a] > sides[b] * sin(angles[a])
 
     def calculate_last_angle(self):
         """Calculates one last unknown angle"""
+        isnan, pi = math.isnan, math.pi
+        angles = self.angles
         for i in range(3):
-            if self.angles[i] is not None:
+            if not isnan(angles[i]):
                 continue
 
-            a, b = rest(self.angles, i)
-            self.angles[i] = math.pi - (a + b)
+            j, k = _OTHERS[i]
+            angles[i] = pi - (angles[j] + angles[k])
+
+    def calculate_sines(self):
+        """Calculates the sines of the angles that do not have one yet,
+        so each is only calculated once per solve
+        """
+        sin = _cordic_sin if USE_CORDIC else math.sin
+        isnan = math.isnan
+        angles, sines = self.angles, self.sines
+        for i in range(3):
+            if isnan(sines[i]):
+                sines[i] = sin(angles[i])
 
     def calculate_two_sides(self):
         """When at least 1 side and 2 angles are known"""
         self.calculate_last_angle()
+        self.calculate_sines()
+        isnan = math.isnan
+        sides, sines = self.sides, self.sines
         for i in range(3):
-            if self.sides[i] is None:
+            if isnan(sides[i]):
                 continue
 
+            # Law of sines: sin(A) / a = sin(B) / b
+            # b = sin(B) * a / sin(A)
+            ratio = sides[i] / sines[i]
             for j in range(3):
-                if self.sides[j] is not None:
+                if not isnan(sides[j]):
                     continue
-                # Law of sines: sin(A) / a = sin(B) / b
-                # b = a * sin(B) / sin(A)
-                self.sides[j] = math.sin(self.angles[j]) * self.sides[i] / math.sin(self.angles[i])
+                sides[j] = sines[j] * ratio
+            break
 
     def calculate_two_angles(self):
         """When 2 sides and 1 angle are known"""
+        if USE_CORDIC:
+            sin, asin = _cordic_sin, _cordic_asin
+        else:
+            sin, asin = math.sin, math.asin
+        isnan, sqrt = math.isnan, math.sqrt
+        sides, angles, sines = self.sides, self.angles, self.sines
         for i in range(3):
-            if self.angles[i] is None:
+            if isnan(angles[i]):
                 continue
 
-            if self.sides[i] is None:
+            if isnan(sides[i]):
                 # Law of cosines: c^2 = a^2 + b^2 - 2ab cos(C)
-                # c = sqrt(a^2 + b^2 - 2ab cos(C))
-                a, b = rest(self.sides, i)
-                self.sides[i] = math.sqrt(a**2 + b**2 - 2 * a * b * math.cos(self.angles[i]))
-                self.calculate_three_angles()
-            else:
-                for j in range(3):
-                    if self.sides[j] is None or i == j:
-                        continue
-                    # Law of sines: sin A / a = sin B / b
-                    # B = arcsin(b * sin A / a)
-                    self.angles[j] = math.asin(math.sin(self.angles[i]) * self.sides[j] / self.sides[i])
-
-                    if self.is_ambigous(i, j) and not self.is_alternative:
-                        copy = dataclasses.replace(self)
-                        copy.is_alternative = True
-                        copy.angles[j] = math.pi - self.angles[j]
-                        copy.calculate_two_sides()
-
-                        copy.validate(True)
-                        copy.calculate_other()
-                        self.alternative = copy
-
-                    self.calculate_two_sides()
-
-    def calculate_three_angles(self):
+                # c = sqrt((a - b)^2 + 4ab sin^2(C / 2)), which does not cancel for small angles
+                j, k = _OTHERS[i]
+                a, b = sides[j], sides[k]
+                sin_half = sin(0.5 * angles[i])
+                sides[i] = sqrt((a - b) * (a - b) + 4 * a * b * sin_half * sin_half)
+                self.calculate_missing_angles()
+                return
+
+            # Law of sines: sin A / a = sin B / b
+            # B = arcsin(b * sin A / a)
+            sines[i] = sin(angles[i])
+            ratio = sines[i] / sides[i]
+            j, k = _OTHERS[i]
+            if isnan(sides[j]):
+                j, k = k, j
+            sines[j] = sides[j] * ratio
+            if sines[j] > 1 + _SINE_TOLERANCE:
+                raise TriangleException(TriangleError.INVALID_TRIANGLE)
+
+            # A right angle at j can round the sine just past 1
+            sines[j] = min(sines[j], 1.0)
+            angles[j] = asin(sines[j])
+            if self.is_ambigous(i, j):
+                self.calculate_alternative(i, j, ratio, sin)
+
+            # Only angle k and side k are left, so the general law of sines pass is not needed
+            angles[k] = math.pi - (angles[i] + angles[j])
+            sines[k] = sin(angles[k])
+            sides[k] = sines[k] / ratio
+            return
+
+    def calculate_alternative(self, i: int, j: int, ratio: float, sin):
+        """Calculates the second solution of the ambiguous case,
+        where angle j is the supplement of the one just found
+        and ratio is sin(A) / a of the known pair i
+        """
+        pi = math.pi
+        sides, angles = list(self.sides), list(self.angles)
+        k = 3 - i - j
+        angles[j] = pi - angles[j]
+        angles[k] = pi - (angles[i] + angles[j])
+        # Law of sines: sin(A) / a = sin(B) / b
+        # b = sin(B) * a / sin(A)
+        sides[k] = sin(angles[k]) / ratio
+        self.alternative = _complete(tuple(sides), tuple(angles), sin)
+
+    def calculate_missing_angles(self):
         """When all 3 sides are known"""
+        acos = _cordic_acos if USE_CORDIC else math.acos
+        isnan = math.isnan
+        sides, angles = self.sides, self.angles
+        missing = isnan(angles[0]) + isnan(angles[1]) + isnan(angles[2])
         for i in range(3):
+            if missing == 1:
+                break
+            if not isnan(angles[i]):
+                continue
+
             # Law of Cosines: c^2 = a^2 + b^2 - 2ab cos(C)
             # C = arccos((a^2 + b^2 - c^2) / 2ab)
-            a, b = rest(self.sides, i)
-            self.angles[i] = math.acos((a**2 + b**2 - self.sides[i] ** 2) / (2 * a * b))
+            j, k = _OTHERS[i]
+            a, b = sides[j], sides[k]
+            angles[i] = acos((a * a + b * b - sides[i] * sides[i]) / (2 * a * b))
+            missing -= 1
+
+        # The last angle follows from the sum of angles, saving an arccos
+        self.calculate_last_angle()
 
     def calculate_other(self):
         """Calculate other unrelated variables"""
-        self.perimeter = sum(self.sides)
-        # Heron's formula: A = sqrt(s(s - a)(s - b)(s - c)) where s = (a + b + c) / 2
-        s = self.perimeter / 2
-        self.area = s * (s - self.sides[0]) * (s - self.sides[1]) * (s - self.sides[2])
-        for i in range(3):
-            a, b = rest(range(3), i)
-            self.altitudes[i] = math.sin(self.angles[a]) * self.sides[b]
-            self.medians[i] = math.sqrt((self.sides[a] ** 2 + self.sides[b] ** 2 - self.sides[i] ** 2 / 2) / 2)
+        self.calculate_sines()
+        sines = self.sines
+        self.perimeter, self.area, altitudes, medians = _other(*self.sides, sines[0], sines[1])
+        self.altitudes = list(altitudes)
+        self.medians = list(medians)
 
     def solve(self):
         """Solves the triangle"""
         self.validate()
-        side_count = len([x for x in self.sides if x is not None])
-
-        if side_count == 3:
-            self.calculate_three_angles()
-        elif side_count == 2:
-            self.calculate_two_angles()
-        elif side_count == 1:
-            self.calculate_two_sides()
-
+        _DISPATCH[self.known_sides_mask()](self)
         self.validate(True)
         self.calculate_other()
 
 
-def solve(sides: List[MaybeFloat], angles: List[MaybeFloat]) -> Optional[Triangle]:
-    """Main solving routine"""
-    solver = TriangleSolver(sides=ensure_size(sides, None, 3), angles=ensure_size(angles, None, 3))
+# Solving method for each mask of known sides, indexed by the mask itself.
+# No sides being known is caught by validation.
+_DISPATCH = (
+    None,
+    TriangleSolver.calculate_two_sides,  # 0b001
+    TriangleSolver.calculate_two_sides,  # 0b010
+    TriangleSolver.calculate_two_angles,  # 0b011
+    TriangleSolver.calculate_two_sides,  # 0b100
+    TriangleSolver.calculate_two_angles,  # 0b101
+    TriangleSolver.calculate_two_angles,  # 0b110
+    TriangleSolver.calculate_missing_angles,  # 0b111
+)
+
 
+# Holds a reusable solver for each thread, never handed out to callers
+_POOL = threading.local()
+
+
+@functools.lru_cache(maxsize=4096)
+def _solve_cached(sides: Tuple[MaybeFloat, ...], angles: Tuple[MaybeFloat, ...], _use_cordic: bool) -> Triangle:
+    """Solves a triangle, memoized on its inputs.
+    The trig backend is part of the key so that changing USE_CORDIC takes effect.
+    """
+    solver = getattr(_POOL, "solver", None)
+    if solver is None:
+        solver = _POOL.solver = TriangleSolver(sides=(), angles=())
+
+    solver.reset(sides, angles)
     solver.solve()
     return Triangle(
-        sides=solver.sides,
-        angles=solver.angles,
-        altitudes=solver.altitudes,
-        medians=solver.medians,
+        sides=tuple(solver.sides),
+        angles=tuple(solver.angles),
+        altitudes=tuple(solver.altitudes),
+        medians=tuple(solver.medians),
         perimeter=solver.perimeter,
         area=solver.area,
     )
+
+
+def solve(sides: Sequence[MaybeFloat], angles: Sequence[MaybeFloat]) -> Optional[Triangle]:
+    """Main solving routine"""
+    return _solve_cached(tuple(sides), tuple(angles), USE_CORDIC)
+
+
+# The specialized solvers below name sides a, b, c and their opposite angles A, B, C.
+# pylint: disable=invalid-name
+
+
+def _complete(sides: Tuple[float, float, float], angles: Tuple[float, float, float], sin=math.sin) -> Triangle:
+    """Builds a Triangle from its solved sides and angles"""
+    perimeter, area, altitudes, medians = _other(*sides, sin(angles[0]), sin(angles[1]))
+    return Triangle(
+        sides=sides,
+        angles=angles,
+        altitudes=altitudes,
+        medians=medians,
+        perimeter=perimeter,
+        area=area,
+    )
+
+
+def solve_sss(a: float, b: float, c: float) -> Triangle:
+    """Solves a triangle from its 3 sides"""
+    # This also rules out sides that are not positive
+    if not abs(a - b) < c < a + b:
+        raise TriangleException(TriangleError.INVALID_SIDE)
+
+    # Law of Cosines: c^2 = a^2 + b^2 - 2ab cos(C)
+    # C = arccos((a^2 + b^2 - c^2) / 2ab)
+    acos = math.acos
+    A = acos((b * b + c * c - a * a) / (2 * b * c))
+    B = acos((a * a + c * c - b * b) / (2 * a * c))
+    return _complete((a, b, c), (A, B, math.pi - A - B))
+
+
+def solve_sas(a: float, C: float, b: float) -> Triangle:
+    """Solves a triangle from 2 sides and the angle between them"""
+    if not (a > 0 and b > 0):
+        raise TriangleException(TriangleError.INVALID_SIDE)
+
+    if not 0 < C < math.pi:
+        raise TriangleException(TriangleError.INVALID_ANGLE)
+
+    # Law of cosines: c^2 = a^2 + b^2 - 2ab cos(C)
+    # c = sqrt((a - b)^2 + 4ab sin^2(C / 2)), which does not cancel for small angles
+    sin_half = math.sin(0.5 * C)
+    c = math.sqrt((a - b) * (a - b) + 4 * a * b * sin_half * sin_half)
+    A = math.acos((b * b + c * c - a * a) / (2 * b * c))
+    return _complete((a, b, c), (A, math.pi - A - C, C))
+
+
+def solve_asa(A: float, c: float, B: float) -> Triangle:
+    """Solves a triangle from 2 angles and the side between them"""
+    if not c > 0:
+        raise TriangleException(TriangleError.INVALID_SIDE)
+
+    C = math.pi - A - B
+    if not (A > 0 and B > 0 and C > 0):
+        raise TriangleException(TriangleError.INVALID_ANGLE)
+
+    # Law of sines: sin(A) / a = sin(B) / b
+    # b = sin(B) * a / sin(A)
+    sin = math.sin
+    ratio = c / sin(C)
+    return _complete((sin(A) * ratio, sin(B) * ratio, c), (A, B, C))
+
+
+def solve_aas(A: float, B: float, a: float) -> Triangle:
+    """Solves a triangle from 2 angles and the side opposite to the first"""
+    if not a > 0:
+        raise TriangleException(TriangleError.INVALID_SIDE)
+
+    C = math.pi - A - B
+    if not (A > 0 and B > 0 and C > 0):
+        raise TriangleException(TriangleError.INVALID_ANGLE)
+
+    sin = math.sin
+    ratio = a / sin(A)
+    return _complete((a, sin(B) * ratio, sin(C) * ratio), (A, B, C))
+
+
+def solve_ssa(a: float, b: float, A: float) -> Triangle:
+    """Solves a triangle from 2 sides and the angle opposite to the first.
+    In the ambiguous case, the solution with an acute B is returned.
+    """
+    if not (a > 0 and b > 0):
+        raise TriangleException(TriangleError.INVALID_SIDE)
+
+    if not 0 < A < math.pi:
+        raise TriangleException(TriangleError.INVALID_ANGLE)
+
+    # Law of sines: sin B = b * sin A / a
+    sin = math.sin
+    ratio = sin(A) / a
+    sin_b = b * ratio
+    if sin_b > 1 + _SINE_TOLERANCE:
+        raise TriangleException(TriangleError.INVALID_TRIANGLE)
+
+    # A right angle at B can round the sine just past 1
+    B = math.asin(min(sin_b, 1.0))
+    C = math.pi - A - B
+    if C <= 0:
+        raise TriangleException(TriangleError.INVALID_TRIANGLE)
+
+    return _complete((a, b, sin(C) / ratio), (A, B, C))
+
+
+# pylint: enable=invalid-name
+
+
+# Columns of the remaining two elements for each column of an (N, 3) array, from `_OTHERS`
+_OTHER_COLUMNS = tuple(list(columns) for columns in zip(*_OTHERS))
+
+
+def _cosines_angles_np(sides):
+    """Calculates the angle opposite to each side in an (N, 3) array of sides"""
+    # Law of Cosines: c^2 = a^2 + b^2 - 2ab cos(C)
+    # C = arccos((a^2 + b^2 - c^2) / 2ab)
+    j, k = _OTHER_COLUMNS
+    squares = sides * sides
+    return np.arccos((squares[:, j] + squares[:, k] - squares) / (2 * sides[:, j] * sides[:, k]))
+
+
+def _solve_np(sides, angles):
+    """Solves the unknown sides and angles in two (N, 3) arrays,
+    setting rows that are not a valid triangle to nan
+    """
+    j, k = _OTHER_COLUMNS
+    side_count = np.count_nonzero(~np.isnan(sides), axis=1)
+    known_count = side_count + np.count_nonzero(~np.isnan(angles), axis=1)
+    two_sides = (side_count == 2)[:, None]
+
+    # Law of cosines: c^2 = a^2 + b^2 - 2ab cos(C)
+    # c = sqrt((a - b)^2 + 4ab sin^2(C / 2)), which does not cancel for small angles
+    a, b = sides[:, j], sides[:, k]
+    sas = two_sides & np.isnan(sides) & ~np.isnan(angles)
+    sides = np.where(sas, np.sqrt((a - b) * (a - b) + 4 * a * b * np.square(np.sin(0.5 * angles))), sides)
+
+    # Law of sines: sin A / a = sin B / b
+    # B = arcsin(b * sin A / a)
+    ssa = two_sides & ~sas.any(axis=1, keepdims=True) & np.isnan(angles) & ~np.isnan(sides)
+    ratio = np.fmax.reduce(np.sin(angles) / sides, axis=1, keepdims=True)
+    angles = np.where(ssa, np.arcsin(sides * ratio), angles)
+
+    sss = ~np.isnan(sides).any(axis=1, keepdims=True) & np.isnan(angles)
+    angles = np.where(sss, _cosines_angles_np(sides), angles)
+
+    last = (np.count_nonzero(np.isnan(angles), axis=1) == 1)[:, None] & np.isnan(angles)
+    angles = np.where(last, math.pi - np.nansum(angles, axis=1, keepdims=True), angles)
+
+    # Law of sines: sin(A) / a = sin(B) / b
+    # b = a * sin(B) / sin(A)
+    ratio = np.fmax.reduce(sides / np.sin(angles), axis=1, keepdims=True)
+    sides = np.where(np.isnan(sides), np.sin(angles) * ratio, sides)
+
+    # Comparisons against nan are false, so rows left unsolved are invalid too
+    a, b = sides[:, j], sides[:, k]
+    valid = (
+        (side_count > 0)
+        & (known_count == 3)
+        & (angles > 0).all(axis=1)
+        & ((np.abs(a - b) < sides) & (sides < a + b)).all(axis=1)
+    )
+    sides[~valid] = math.nan
+    angles[~valid] = math.nan
+    return sides, angles
+
+
+def _other_np(sides, angles):
+    """Calculates the perimeter, area, altitudes and medians of two (N, 3) arrays of solved sides and angles"""
+    j, k = _OTHER_COLUMNS
+    perimeter = sides.sum(axis=1)
+    # Heron's formula in Kahan's form, which stays accurate for needle-like triangles:
+    # A = sqrt((x + (y + z))(z - (x - y))(z + (x - y))(x + (y - z))) / 4 where x >= y >= z
+    z, y, x = np.sort(sides, axis=1).T
+    area = 0.25 * np.sqrt((x + (y + z)) * (z - (x - y)) * (z + (x - y)) * (x + (y - z)))
+    a, b = sides[:, j], sides[:, k]
+    altitudes = np.sin(angles[:, j]) * b
+    # Apollonius's theorem: m_a = sqrt(2b^2 + 2c^2 - a^2) / 2
+    medians = 0.5 * np.sqrt(2 * a * a + 2 * b * b - sides * sides)
+    return perimeter, area, altitudes, medians
+
+
+def solve_batch(sides, angles) -> Triangle:
+    """Solves many triangles at once.
+    Takes two (N, 3) arrays of sides and angles, using nan for unknowns,
+    and returns a `Triangle` whose fields are arrays with one row per triangle.
+    A single triangle can be given as two length 3 arrays, in which case
+    the fields have no triangle dimension.
+    Rows that do not give exactly 3 values including a side, or whose values
+    do not form a triangle, come out as nan rather than raising.
+    The ambiguous case always gives the acute solution.
+    """
+    if np is None:
+        raise ImportError("solve_batch requires numpy")
+
+    single = np.ndim(sides) == 1
+    sides = np.array(np.atleast_2d(sides), dtype=np.float64)
+    angles = np.array(np.atleast_2d(angles), dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sides, angles = _solve_np(sides, angles)
+        perimeter, area, altitudes, medians = _other_np(sides, angles)
+
+    if single:
+        return Triangle(
+            sides=sides[0],
+            angles=angles[0],
+            altitudes=altitudes[0],
+            medians=medians[0],
+            perimeter=perimeter[0],
+            area=area[0],
+        )
+
+    return Triangle(
+        sides=sides,
+        angles=angles,
+        altitudes=altitudes,
+        medians=medians,
+        perimeter=perimeter,
+        area=area,
+    )
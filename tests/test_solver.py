@@ -0,0 +1,305 @@
+"""Regression tests for the triangle solver"""
+
+import decimal
+import math
+import sys
+import threading
+from fractions import Fraction
+
+import pytest
+
+import src
+
+# solve_batch fills the float fields of Triangle with arrays
+# pylint: disable=unsubscriptable-object
+
+NAN = math.nan
+
+# The 3-4-5 right triangle, given as each kind of input
+RIGHT_ANGLES = (math.atan2(3, 4), math.atan2(4, 3), math.pi / 2)
+RIGHT_INPUTS = [
+    ([3, 4, 5], [NAN, NAN, NAN]),
+    ([3, 4, NAN], [NAN, NAN, RIGHT_ANGLES[2]]),
+    ([3, NAN, 5], [NAN, NAN, RIGHT_ANGLES[2]]),
+    ([3, NAN, NAN], [RIGHT_ANGLES[0], RIGHT_ANGLES[1], NAN]),
+    ([NAN, NAN, 5], [RIGHT_ANGLES[0], RIGHT_ANGLES[1], NAN]),
+]
+
+
+def test_batch_solves_each_case():
+    """Solves SSS, SAS, SSA, AAS and ASA rows together"""
+    np = pytest.importorskip("numpy")
+    sides, angles = zip(*RIGHT_INPUTS)
+    triangle = src.solve_batch(sides, angles)
+    np.testing.assert_allclose(triangle.sides, [[3, 4, 5]] * len(RIGHT_INPUTS))
+    np.testing.assert_allclose(triangle.angles, [RIGHT_ANGLES] * len(RIGHT_INPUTS))
+    np.testing.assert_allclose(triangle.area, 6.0)
+    np.testing.assert_allclose(triangle.perimeter, 12.0)
+
+
+@pytest.mark.parametrize(
+    "sides, angles",
+    [
+        ([5, NAN, NAN], [2.0, 1.5, NAN]),
+        ([3, 4, 5], [0.6, NAN, NAN]),
+        ([1, 5, NAN], [0.5, NAN, NAN]),
+        ([1, 2, 5], [NAN, NAN, NAN]),
+        ([NAN, NAN, NAN], [0.5, 1.0, 1.2]),
+    ],
+)
+def test_batch_masks_invalid_rows(sides, angles):
+    """Sets rows that are not valid triangles to nan"""
+    np = pytest.importorskip("numpy")
+    triangle = src.solve_batch([sides, [3, 4, 5]], [angles, [NAN, NAN, NAN]])
+    assert np.isnan(triangle.sides[0]).all()
+    assert np.isnan(triangle.angles[0]).all()
+    assert np.isnan(triangle.area[0])
+    assert triangle.area[1] == pytest.approx(6.0)
+
+
+def test_solve_is_memoized():
+    """Returns the same frozen result for repeated inputs"""
+    triangle = src.solve([3, 4, 5], [None, None, None])
+    assert src.solve((3, 4, 5), (None, None, None)) is triangle
+    assert triangle.sides == (3, 4, 5)
+    assert triangle.angles == pytest.approx(RIGHT_ANGLES)
+    with pytest.raises(AttributeError):
+        triangle.area = 0
+
+
+@pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need python 3.10")
+def test_results_have_slots():
+    """Keeps no __dict__ on results or on solvers"""
+    assert not hasattr(src.solve([3, 4, 5], []), "__dict__")
+    assert not hasattr(src.TriangleSolver(sides=[3, 4, 5], angles=[]), "__dict__")
+
+
+@pytest.mark.parametrize(
+    "sides, area",
+    [
+        ([3, 4, 5], 6.0),
+        ([2, 2, 2], math.sqrt(3)),
+        ([5, 5, 6], 12.0),
+    ],
+)
+def test_area(sides, area):
+    """Takes the square root in Heron's formula"""
+    triangle = src.solve(sides, [None, None, None])
+    assert triangle.area == pytest.approx(area)
+    assert triangle.perimeter == pytest.approx(sum(sides))
+
+
+def test_needle_area():
+    """Keeps the area of a needle-like triangle accurate"""
+    # Kahan's needle-like triangle, checked against the exact area of the same doubles
+    sides = (100000.0, 99999.99979, 0.00029)
+    a, b, c = (Fraction(x) for x in sides)
+    product = (a + b + c) * (-a + b + c) * (a - b + c) * (a + b - c)
+    with decimal.localcontext() as context:
+        context.prec = 50
+        exact = decimal.Decimal(product.numerator) / product.denominator
+        area = float(exact.sqrt() / 4)
+    assert src.solve(sides, []).area == pytest.approx(area, rel=1e-12)
+
+
+def test_solver_keeps_caller_lists():
+    """Solves into its own buffer, leaving the given lists as they were"""
+    sides, angles = [3, 4, 5], [None, None, None]
+    solver = src.TriangleSolver(sides=sides, angles=angles)
+    solver.solve()
+    assert sides == [3, 4, 5]
+    assert angles == [None, None, None]
+    assert list(solver.angles) == pytest.approx(RIGHT_ANGLES)
+    assert solver.area == pytest.approx(6.0)
+
+
+def test_validate_helpers():
+    """Check single sides and angles the same way validate() does"""
+    solver = src.TriangleSolver(sides=[1, 2, 5], angles=[None, None, 3.5])
+    assert not solver.validate_side(2)
+    assert not solver.validate_angle(2)
+    with pytest.raises(src.TriangleException) as info:
+        solver.validate()
+    assert info.value.args == (src.TriangleError.INVALID_SIDE,)
+    solver = src.TriangleSolver(sides=[3, None, 5], angles=[None, 1.0, None])
+    assert solver.validate_side(0) and solver.validate_side(2)
+    assert solver.validate_angle(1)
+
+
+def test_sas_with_obtuse_angle():
+    """Stops once the side opposite the known angle is found"""
+    triangle = src.solve([None, 6, 8], [0.9, None, None])
+    assert sum(triangle.angles) == pytest.approx(math.pi)
+    assert triangle.sides[0] == pytest.approx(math.sqrt(36 + 64 - 96 * math.cos(0.9)))
+
+
+def test_sas_with_tiny_angle():
+    """Finds the short third side without cancelling it to zero"""
+    assert src.solve([1, 1], [None, None, 1e-8]).sides[2] == pytest.approx(1e-8)
+    assert src.solve_sas(1, 1e-8, 1).sides[2] == pytest.approx(1e-8)
+
+
+# pylint: disable=protected-access
+@pytest.mark.parametrize(
+    "cordic, libm, inputs",
+    [
+        (src._cordic_sin, math.sin, [i / 100 * math.pi for i in range(-100, 101)]),
+        (src._cordic_cos, math.cos, [i / 100 * math.pi for i in range(-100, 101)]),
+        (src._cordic_acos, math.acos, [i / 100 for i in range(-100, 101)]),
+        (src._cordic_asin, math.asin, [i / 100 for i in range(-100, 101)]),
+    ],
+)
+def test_cordic_matches_libm(cordic, libm, inputs):
+    """Agrees with libm to within a few ulps of the table's 40 steps"""
+    for x in inputs:
+        assert cordic(x) == pytest.approx(libm(x), rel=0, abs=5e-12)
+
+
+def test_cache_follows_trig_backend(monkeypatch):
+    """Solves again when USE_CORDIC changes"""
+    exact = src.solve([3, 4, 5], [None, None, None])
+    monkeypatch.setattr(src, "USE_CORDIC", True)
+    cordic = src.solve([3, 4, 5], [None, None, None])
+    assert cordic is not exact
+    assert cordic.angles[0] == src._cordic_acos((16 + 25 - 9) / 40)
+    assert cordic.angles == pytest.approx(exact.angles, abs=5e-12)
+    monkeypatch.setattr(src, "USE_CORDIC", False)
+    assert src.solve([3, 4, 5], [None, None, None]) is exact
+
+
+def test_sas_keeps_given_angle():
+    """Only calculates the angles that were not given"""
+    assert src.solve([None, 6, 8], [0.9, None, None]).angles[0] == 0.9
+    assert src.solve([3, None, 5], [None, 0.1, None]).angles[1] == 0.1
+
+
+def test_pool_reuses_solver_per_thread():
+    """Solves on one solver per thread without leaking it into results"""
+    first = src.solve([6, 8, 10], [None, None, None])
+    solver = src._POOL.solver
+    second = src.solve([5, 5, 6], [None, None, None])
+    assert src._POOL.solver is solver
+    assert first.sides == (6, 8, 10)
+    assert first.area == pytest.approx(24.0)
+    assert second.area == pytest.approx(12.0)
+
+    solvers = []
+
+    def solve_in_thread():
+        src.solve([7, 8, 9], [None, None, None])
+        solvers.append(src._POOL.solver)
+
+    thread = threading.Thread(target=solve_in_thread)
+    thread.start()
+    thread.join()
+    assert solvers and solvers[0] is not solver
+
+
+@pytest.mark.parametrize(
+    "specialized, args, sides, angles",
+    [
+        (src.solve_sss, (4, 5, 6), [4, 5, 6], [None, None, None]),
+        (src.solve_sas, (4, 1.1, 5), [4, 5, None], [None, None, 1.1]),
+        (src.solve_asa, (0.7, 6, 1.3), [None, None, 6], [0.7, 1.3, None]),
+        (src.solve_aas, (0.7, 1.3, 4), [4, None, None], [0.7, 1.3, None]),
+        (src.solve_ssa, (5, 4, 1.2), [5, 4, None], [1.2, None, None]),
+    ],
+)
+def test_specialized_matches_solve(specialized, args, sides, angles):
+    """Gives the same triangle as solve() for the same inputs"""
+    triangle = specialized(*args)
+    expected = src.solve(sides, angles)
+    assert triangle.sides == pytest.approx(expected.sides)
+    assert triangle.angles == pytest.approx(expected.angles)
+    assert triangle.altitudes == pytest.approx(expected.altitudes)
+    assert triangle.medians == pytest.approx(expected.medians)
+    assert triangle.perimeter == pytest.approx(expected.perimeter)
+    assert triangle.area == pytest.approx(expected.area)
+
+
+@pytest.mark.parametrize(
+    "specialized, args, error",
+    [
+        (src.solve_sss, (1, 2, 5), src.TriangleError.INVALID_SIDE),
+        (src.solve_sss, (-3, 4, 5), src.TriangleError.INVALID_SIDE),
+        (src.solve_sas, (3, -1, 4), src.TriangleError.INVALID_ANGLE),
+        (src.solve_sas, (3, 0, 4), src.TriangleError.INVALID_ANGLE),
+        (src.solve_sas, (3, 4, 4), src.TriangleError.INVALID_ANGLE),
+        (src.solve_sas, (0, 1, 4), src.TriangleError.INVALID_SIDE),
+        (src.solve_asa, (1, -2, 1), src.TriangleError.INVALID_SIDE),
+        (src.solve_asa, (2, 1, 1.5), src.TriangleError.INVALID_ANGLE),
+        (src.solve_asa, (-0.5, 1, 2), src.TriangleError.INVALID_ANGLE),
+        (src.solve_aas, (1, 1, -3), src.TriangleError.INVALID_SIDE),
+        (src.solve_aas, (0, 1, 3), src.TriangleError.INVALID_ANGLE),
+        (src.solve_ssa, (5, 6, 0), src.TriangleError.INVALID_ANGLE),
+        (src.solve_ssa, (-5, 6, 1), src.TriangleError.INVALID_SIDE),
+        (src.solve_ssa, (1, 5, 0.5), src.TriangleError.INVALID_TRIANGLE),
+    ],
+)
+def test_specialized_rejects_invalid(specialized, args, error):
+    """Raises before calculating anything from impossible inputs"""
+    with pytest.raises(src.TriangleException) as info:
+        specialized(*args)
+    assert info.value.args == (error,)
+
+
+def test_ssa_right_angle_rounding():
+    """Accepts a right angle whose sine rounds just past 1"""
+    triangle = src.solve_ssa(0.3221255116280285, 5.14337292821393, 0.06267025043969218)
+    assert triangle.angles[1] == pytest.approx(math.pi / 2)
+
+
+def test_solve_ssa_rounding():
+    """Accepts a sine that rounds just past 1 and rejects ones that are really past it"""
+    triangle = src.solve([0.3221255116280285, 5.14337292821393], [0.06267025043969218])
+    assert triangle.angles[1] == pytest.approx(math.pi / 2)
+    with pytest.raises(src.TriangleException) as info:
+        src.solve([1, 5], [0.5])
+    assert info.value.args == (src.TriangleError.INVALID_TRIANGLE,)
+
+
+def test_ambiguous_alternative():
+    """Gives the second SSA solution, with the supplement of the found angle"""
+    solver = src.TriangleSolver(sides=[3, 4, None], angles=[0.6, None, None])
+    solver.solve()
+    alternative = solver.alternative
+    assert alternative.angles[0] == 0.6
+    assert alternative.angles[1] == pytest.approx(math.pi - solver.angles[1])
+    assert sum(alternative.angles) == pytest.approx(math.pi)
+    assert alternative.sides[:2] == (3, 4)
+    assert alternative.angles == pytest.approx(src.solve_sss(*alternative.sides).angles)
+    assert alternative.area == pytest.approx(src.solve_sss(*alternative.sides).area)
+
+    unambiguous = src.TriangleSolver(sides=[5, 4, None], angles=[1.2, None, None])
+    unambiguous.solve()
+    assert unambiguous.alternative is None
+
+
+@pytest.mark.parametrize(
+    "sides, angles",
+    [
+        ([3, 4], [None, None, 1.2]),
+        ([7, None, 9], [None, 0.7]),
+        ([None, 6, 8], [0.9]),
+        ([7, 8, 9], []),
+        ([5], [None, 1.1, 0.9]),
+        ([None, None, 4], [0.5, 1.3]),
+        ([6, 8], [0.6]),
+    ],
+)
+def test_batch_matches_scalar(sides, angles):
+    """Gives the same results as solve for valid triangles"""
+    np = pytest.importorskip("numpy")
+
+    def full(values):
+        return [NAN if x is None else x for x in [*values, None, None, None][:3]]
+
+    expected = src.solve(sides, angles)
+    batch = src.solve_batch([full(sides)], [full(angles)])
+    single = src.solve_batch(full(sides), full(angles))
+    for field in ("sides", "angles", "altitudes", "medians"):
+        np.testing.assert_allclose(getattr(batch, field)[0], getattr(expected, field))
+        np.testing.assert_allclose(getattr(single, field), getattr(expected, field))
+    np.testing.assert_allclose(batch.area[0], expected.area)
+    np.testing.assert_allclose(batch.perimeter[0], expected.perimeter)
+    assert np.ndim(single.area) == 0